@@ -1,7 +1,14 @@
 import argparse
 import json
+import logging
+import queue
+import re
+import threading
 import time
-from typing import Any, Dict, List, Optional, Tuple
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 import cv2
 import numpy as np
@@ -36,35 +43,51 @@ except Exception as e:
         print("Error: Failed to configure PyTorch safety patch")
 
 from ultralytics import YOLO
+from ultralytics.utils import ops
+
+# Optional: INT8 ONNX inference through onnxruntime
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+# Optional: INT8 OpenVINO IR inference on Intel CPUs
+try:
+    import openvino as ov
+except ImportError:
+    ov = None
+
+# Optional: in-process video decoding for files cv2 cannot open
+try:
+    import av
+except ImportError:
+    av = None
 
 # ------------------ CONFIG ------------------
 VIDEO_SOURCE = 0
 WIDTH = 640
 MODEL_NAME = "yolov8n.pt"
+ONNX_MODEL_NAME = "yolov8n_int8.onnx"
+OPENVINO_MODEL_DIR = "yolov8n_int8_openvino_model"
+OPENVINO_CALIB_DATA = "coco128.yaml"  # calibration dataset for the Ultralytics INT8 export
+NMS_IOU = 0.7  # Ultralytics default, shared by every backend (person_count depends on it)
+BATCH_SIZE = 4  # frames per model call in video analysis
+DETECT_EVERY = 3  # run detection on every Nth webcam frame, redraw the last boxes in between
 
 import os
 import sys
 
-def get_model_path():
-    """Resolve path to yolov8n.pt model file"""
-    if os.path.exists(MODEL_NAME):
-        return MODEL_NAME
-
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    model_path = os.path.join(script_dir, MODEL_NAME)
-    if os.path.exists(model_path):
-        return model_path
+# Diagnostics go to stderr through logging so stdout stays a clean JSON channel
+log = logging.getLogger("proctor")
 
-    for _ in range(3):
-        script_dir = os.path.dirname(script_dir)
-        model_path = os.path.join(script_dir, "server", MODEL_NAME)
-        if os.path.exists(model_path):
-            return model_path
-        model_path = os.path.join(script_dir, MODEL_NAME)
-        if os.path.exists(model_path):
-            return model_path
-
-    return MODEL_NAME
+@lru_cache(maxsize=None)
+def get_model_path(name=MODEL_NAME):
+    """Resolve path to a model file or directory (defaults to yolov8n.pt), caching misses too"""
+    script_dir = Path(__file__).resolve().parent
+    candidates = [Path(name), script_dir / name]
+    for parent in list(script_dir.parents)[:3]:
+        candidates += [parent / "server" / name, parent / name]
+    return str(next((p for p in candidates if p.exists()), name))
 
 DEVICE_KEYWORDS = {
     "cell phone",
@@ -80,11 +103,29 @@ DEVICE_KEYWORDS = {
 PERSON_LABEL = "person"
 MULTI_THRESHOLD = 1
 
-MODEL: Optional[YOLO] = None
+MODEL: Optional[Any] = None  # TorchDetector, OnnxDetector or OpenVinoDetector
 CLASS_NAMES: Optional[Dict[int, str]] = None
+# Class ids resolved once from CLASS_NAMES at model load
+DEVICE_CLASS_IDS: Set[int] = set()
+PHONE_CLASS_IDS: Set[int] = set()
+PERSON_CLASS_ID = -1
+# Class id -> name as an object array, so a whole id column maps to names in one gather
+NAMES_ARR: np.ndarray = np.empty(0, dtype=object)
+# Model input blob (BATCH_SIZE x 3 x WIDTH x WIDTH float32), reused across calls
+_BLOB_BUF: Optional[np.ndarray] = None
+# CUDA only: pinned host staging tensor backing _BLOB_BUF, its device copy and the copy stream
+_HOST_BUF: Optional[torch.Tensor] = None
+_DEV_BUF: Optional[torch.Tensor] = None
+_COPY_STREAM: Optional[Any] = None
+# Letterbox resize output, reused while the frame shape stays the same
+_RESIZE_BUF: Optional[np.ndarray] = None
 QUIET = False
+COMPILE_MODEL = False  # torch.compile the PyTorch model at load (long-running stream mode)
 
 # ------------------ HELPERS ------------------
+class VideoReadError(Exception):
+    """Raised when no frames can be read from a video file"""
+
 def timestamp():
     return time.strftime("%H:%M:%S", time.localtime())
 
@@ -92,25 +133,362 @@ def log_event(event, details=""):
     if not QUIET:
         print(f"[LOG] {timestamp()} | {event} | {details}")
 
-def resize_w(image, width):
+def configure_opencv():
+    """Enable OpenCV's optimized (SIMD/IPP) kernels and warn if this build lacks IPP"""
+    cv2.setUseOptimized(True)
+    cv2.setNumThreads(max(1, (os.cpu_count() or 2) // 2))
+
+    build = cv2.getBuildInformation()
+    ipp = re.search(r"Intel IPP:\s*(\S+)", build)
+    parallel = re.search(r"Parallel framework:\s*(\S+)", build)
+    log.debug("OpenCV %s - IPP: %s, Parallel framework: %s", cv2.__version__,
+              ipp.group(1) if ipp else "NO", parallel.group(1) if parallel else "unknown")
+    if not ipp or ipp.group(1).upper() == "NO":
+        # info, not warning: --quiet stderr ends up in the server-side violation details
+        log.info("OpenCV is built without Intel IPP, resizing will use slower kernels")
+
+def _resize(image, new_w, new_h):
+    """cv2.resize into a preallocated buffer, so same-shape frames resize without allocating"""
+    global _RESIZE_BUF
     h, w = image.shape[:2]
-    if w == width:
+    if (h, w) == (new_h, new_w):
         return image
-    scale = width / w
-    return cv2.resize(image, (width, int(h * scale)))
+    if _RESIZE_BUF is None or _RESIZE_BUF.shape != (new_h, new_w, 3):
+        _RESIZE_BUF = np.empty((new_h, new_w, 3), dtype=np.uint8)
+    # INTER_AREA is both faster and alias-free when downscaling (e.g. 1080p -> 640)
+    interp = cv2.INTER_AREA if new_w < w else cv2.INTER_LINEAR
+    return cv2.resize(image, (new_w, new_h), dst=_RESIZE_BUF, interpolation=interp)
+
+def _fill_blob(image, out, size=WIDTH, pad=114):
+    """Letterbox a BGR frame into out (3 x size x size) as normalized RGB CHW (YOLO letterbox)"""
+    h, w = image.shape[:2]
+    r = min(size / h, size / w)
+    new_w, new_h = int(round(w * r)), int(round(h * r))
+    top = int(round((size - new_h) / 2 - 0.1))
+    left = int(round((size - new_w) / 2 - 0.1))
+    img = _resize(image, new_w, new_h)
+
+    # Pad only the borders, the resized frame is written straight into the centre
+    value = pad / 255.0
+    out[:, :top] = value
+    out[:, top + new_h:] = value
+    out[:, :, :left] = value
+    out[:, :, left + new_w:] = value
+    # BGR->RGB, HWC->CHW, uint8->float32 and /255 in a single pass
+    np.multiply(
+        img[..., ::-1].transpose(2, 0, 1),
+        1 / 255.0,
+        out=out[:, top:top + new_h, left:left + new_w],
+        dtype=np.float32,
+    )
+
+def to_blob(image, size=WIDTH):
+    """BGR uint8 frame -> letterboxed, normalized 1x3xHxW RGB float32 blob"""
+    blob = np.empty((1, 3, size, size), dtype=np.float32)
+    _fill_blob(image, blob[0], size)
+    return blob
+
+def _preprocess(frames, size=WIDTH, device="cpu"):
+    """Preprocess a batch of frames into one BCHW model input tensor on the target device.
+
+    On CUDA the blob lives in pinned memory and is copied into a persistent device
+    buffer asynchronously on a dedicated stream.
+    """
+    global _BLOB_BUF, _HOST_BUF, _DEV_BUF, _COPY_STREAM
+    cuda = device == "cuda"
+    n = len(frames)
+    # Sized for a full batch once, partial batches (and stream mode's batch of 1) use a view
+    if _BLOB_BUF is None or _BLOB_BUF.shape[0] < n or _BLOB_BUF.shape[2] != size:
+        shape = (max(BATCH_SIZE, n), 3, size, size)
+        if cuda:
+            _HOST_BUF = torch.empty(shape, dtype=torch.float32, pin_memory=True)
+            _DEV_BUF = torch.empty(shape, dtype=torch.float32, device=device)
+            _BLOB_BUF = _HOST_BUF.numpy()
+        else:
+            _BLOB_BUF = np.empty(shape, dtype=np.float32)
+    for frame, out in zip(frames, _BLOB_BUF[:n]):
+        _fill_blob(frame, out, size)
+
+    if not cuda:
+        return torch.from_numpy(_BLOB_BUF[:n])
+
+    if _COPY_STREAM is None:
+        _COPY_STREAM = torch.cuda.Stream()
+    with torch.cuda.stream(_COPY_STREAM):
+        _DEV_BUF[:n].copy_(_HOST_BUF[:n], non_blocking=True)
+    # Inference on the current stream must not start before the copy lands
+    torch.cuda.current_stream().wait_stream(_COPY_STREAM)
+    return _DEV_BUF[:n]
+
+# ------------------ PYTORCH BACKEND ------------------
+def _nms_results(preds, conf, iou=NMS_IOU):
+    """Raw YOLOv8 output (B x 84 x N) -> per-image results exposing boxes.data, like Ultralytics"""
+    if isinstance(preds, np.ndarray):
+        preds = torch.from_numpy(preds)
+    dets = ops.non_max_suppression(preds, conf_thres=conf, iou_thres=iou)
+    return [SimpleNamespace(boxes=SimpleNamespace(data=det)) for det in dets]
+
+class TorchDetector:
+    """Runs the yolov8n.pt DetectionModel directly, same interface as OnnxDetector.
+
+    Bypasses the Ultralytics predictor, which copies the whole input batch back to
+    the host and builds a Results object per image; NMS runs on the model's device
+    and only the kept boxes are copied back.
+    """
+
+    def __init__(self, model_path, device="cpu"):
+        yolo = YOLO(model_path)
+        self.names = yolo.model.names
+        self.device = device
+        # FP16 on CUDA, like Ultralytics' half=True
+        self.half = device == "cuda"
+        net = yolo.model.fuse(verbose=False).to(device).eval()
+        self.net = net.half() if self.half else net
+        # Set by ensure_model with --compile, compiled against the first real input batch
+        self.compile_pending = False
+
+    def __call__(self, blob, imgsz=WIDTH, conf=0.25, iou=NMS_IOU, verbose=False):
+        preds = self.net(blob.half() if self.half else blob)
+        # Eval mode returns (predictions, raw head outputs)
+        preds = preds[0] if isinstance(preds, (list, tuple)) else preds
+        return _nms_results(preds.float(), conf, iou)
+
+# ------------------ ONNX BACKEND ------------------
+
+class OnnxDetector:
+    """Runs an exported (INT8) YOLOv8 ONNX model through onnxruntime.
+
+    Called like TorchDetector with a preprocessed BCHW tensor and
+    returns results exposing boxes.data in model input coordinates, so the
+    frame evaluation code works unchanged with either backend.
+    """
+
+    device = "cpu"
+
+    def __init__(self, onnx_path):
+        import ast
+
+        opts = ort.SessionOptions()
+        opts.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        opts.intra_op_num_threads = max(1, (os.cpu_count() or 2) // 2)
+        self.session = ort.InferenceSession(
+            onnx_path, sess_options=opts, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        meta = self.session.get_modelmeta().custom_metadata_map
+        if "names" not in meta:
+            # Without names no person/device class can be resolved and every frame would
+            # silently report "No person detected"
+            raise RuntimeError(f"{onnx_path} has no class names metadata, re-run --mode export-onnx")
+        self.names = ast.literal_eval(meta["names"])
+
+    def __call__(self, blob, imgsz=WIDTH, conf=0.25, iou=NMS_IOU, verbose=False):
+        preds = self.session.run(None, {self.input_name: blob.cpu().numpy()})[0]
+        return _nms_results(preds, conf, iou)
+
+# ------------------ OPENVINO BACKEND ------------------
+class OpenVinoDetector:
+    """Runs an Ultralytics INT8 OpenVINO IR export on the CPU, same interface as OnnxDetector"""
+
+    device = "cpu"
+
+    def __init__(self, ir_dir):
+        import yaml
+
+        core = ov.Core()
+        if not QUIET:
+            # INT8 only pays off with VNNI / DL Boost (10th gen Intel Core and newer)
+            print(f"OpenVINO CPU: {core.get_property('CPU', 'FULL_DEVICE_NAME')}, "
+                  f"capabilities: {core.get_property('CPU', 'OPTIMIZATION_CAPABILITIES')}")
+
+        model = core.read_model(str(next(Path(ir_dir).glob("*.xml"))))
+        # Exports have a static batch of 1, video analysis sends batches of up to BATCH_SIZE
+        model.reshape([-1, 3, WIDTH, WIDTH])
+        self.compiled = core.compile_model(model, "CPU", {"PERFORMANCE_HINT": "LATENCY"})
+        self.output = self.compiled.output(0)
+
+        metadata = Path(ir_dir) / "metadata.yaml"
+        names = yaml.safe_load(metadata.read_text()).get("names") if metadata.exists() else None
+        if not names:
+            raise RuntimeError(f"{ir_dir} has no class names metadata, re-run --mode export-openvino")
+        self.names = names
+
+    def __call__(self, blob, imgsz=WIDTH, conf=0.25, iou=NMS_IOU, verbose=False):
+        preds = self.compiled(blob.cpu().numpy())[self.output]
+        return _nms_results(preds, conf, iou)
+
+def export_openvino_int8(data=OPENVINO_CALIB_DATA):
+    """Export yolov8n.pt to an INT8 OpenVINO IR directory, calibrated by Ultralytics on data"""
+    import shutil
+
+    yolo = YOLO(get_model_path())
+    exported = Path(yolo.export(format="openvino", int8=True, imgsz=WIDTH, data=data))
+    target = exported.parent / OPENVINO_MODEL_DIR
+    if exported.resolve() != target.resolve():
+        shutil.rmtree(target, ignore_errors=True)
+        shutil.move(str(exported), str(target))
+    return str(target)
+
+def export_onnx_int8(calib_video, num_calib=32):
+    """Export yolov8n.pt to ONNX and statically quantize it to INT8 for CPU inference.
+
+    Calibration frames are sampled from a representative proctoring recording.
+    """
+    import onnx
+    from onnxruntime.quantization import (
+        CalibrationDataReader,
+        QuantFormat,
+        QuantType,
+        quantize_static,
+    )
+
+    yolo = YOLO(get_model_path())
+    fp32_path = yolo.export(format="onnx", imgsz=WIDTH, dynamic=True, simplify=True)
+    int8_path = os.path.join(os.path.dirname(os.path.abspath(fp32_path)), ONNX_MODEL_NAME)
+
+    cap = cv2.VideoCapture(calib_video)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or num_calib
+    stride = max(1, total // num_calib)
+    blobs = []
+    idx = 0
+    while len(blobs) < num_calib and cap.grab():
+        if idx % stride == 0:
+            ret, frame = cap.retrieve()
+            if ret and frame is not None:
+                blobs.append(to_blob(frame))
+        idx += 1
+    cap.release()
+    if not blobs:
+        raise RuntimeError(f"No calibration frames could be read from {calib_video}")
+
+    fp32_graph = onnx.load(fp32_path).graph
+    input_name = fp32_graph.input[0].name
+    # Only the backbone/neck convs are quantized. The Detect head's DFL conv and the final
+    # Concat mix box coordinates (~0-640) with class scores (0-1) in one tensor, and a shared
+    # INT8 scale would round every score to 0.
+    head_nodes = [node.name for node in fp32_graph.node if node.name.startswith("/model.22/dfl")]
+
+    class _FrameReader(CalibrationDataReader):
+        def __init__(self):
+            self._it = iter(blobs)
+
+        def get_next(self):
+            blob = next(self._it, None)
+            return None if blob is None else {input_name: blob}
+
+    quantize_static(
+        fp32_path,
+        int8_path,
+        _FrameReader(),
+        quant_format=QuantFormat.QDQ,
+        op_types_to_quantize=["Conv"],
+        nodes_to_exclude=head_nodes,
+        per_channel=True,
+        weight_type=QuantType.QInt8,
+        activation_type=QuantType.QInt8,
+        extra_options={"ActivationSymmetric": True, "WeightSymmetric": True},
+    )
+
+    # Keep the class names (and other Ultralytics metadata) on the quantized model
+    fp32_model = onnx.load(fp32_path)
+    int8_model = onnx.load(int8_path)
+    del int8_model.metadata_props[:]
+    int8_model.metadata_props.extend(fp32_model.metadata_props)
+    onnx.save(int8_model, int8_path)
+
+    # ensure_model prefers this file automatically, so refuse to leave behind a model whose
+    # detections disagree with the PyTorch model on a calibration frame
+    sample = torch.from_numpy(blobs[0])
+    expected = TorchDetector(get_model_path())(sample, imgsz=WIDTH, conf=0.3, iou=NMS_IOU)[0].boxes.data
+    actual = OnnxDetector(int8_path)(sample, imgsz=WIDTH, conf=0.3, iou=NMS_IOU)[0].boxes.data
+    expected_ids = sorted(expected[:, -1].int().tolist())
+    actual_ids = sorted(actual[:, -1].int().tolist())
+    if expected_ids != actual_ids:
+        os.remove(int8_path)
+        raise RuntimeError(
+            f"INT8 model detections {actual_ids} differ from the PyTorch model {expected_ids}, "
+            f"not writing {ONNX_MODEL_NAME}"
+        )
+    return int8_path
 
 # ------------------ MODEL LOADER ------------------
+def _resolve_class_ids(names):
+    global DEVICE_CLASS_IDS, PHONE_CLASS_IDS, PERSON_CLASS_ID, NAMES_ARR
+    NAMES_ARR = np.array(
+        [names.get(cid, str(cid)) for cid in range(max(names, default=-1) + 1)], dtype=object
+    )
+    DEVICE_CLASS_IDS = {
+        cid for cid, name in names.items()
+        if any(keyword in name.lower() for keyword in DEVICE_KEYWORDS)
+    }
+    PHONE_CLASS_IDS = {cid for cid in DEVICE_CLASS_IDS if "phone" in names[cid].lower()}
+    PERSON_CLASS_ID = next((cid for cid, name in names.items() if name == PERSON_LABEL), -1)
+
+def _compile_model(detector, sample):
+    """Specialize the PyTorch network for the fixed WIDTH x WIDTH input with torch.compile.
+
+    Zeros only warm the compiled network up; it replaces the eager one only if both
+    agree on sample, a real letterboxed 1 x 3 x WIDTH x WIDTH frame on the detector's device.
+    """
+    if not hasattr(torch, "compile"):
+        log.warning("torch.compile is not available, using eager model")
+        return
+
+    eager = detector.net
+    dtype = torch.float16 if detector.half else torch.float32
+    sample = sample.to(detector.device, dtype)
+
+    try:
+        # reduce-overhead captures CUDA graphs, removing per-kernel launch overhead
+        compiled = torch.compile(eager, mode="reduce-overhead" if detector.device == "cuda" else "default")
+        with torch.inference_mode():
+            compiled(torch.zeros_like(sample))
+            ref = eager(sample)
+            out = compiled(sample)
+        ref = ref[0] if isinstance(ref, (list, tuple)) else ref
+        out = out[0] if isinstance(out, (list, tuple)) else out
+        if not torch.allclose(ref.float(), out.float(), rtol=1e-3, atol=1e-3):
+            log.warning("Compiled model output differs from eager model, using eager model")
+            return
+        detector.net = compiled
+        if not QUIET:
+            print("YOLO model compiled with torch.compile")
+    except Exception as e:
+        log.warning("torch.compile failed, using eager model: %s", e)
+
 def ensure_model():
     global MODEL, CLASS_NAMES
     if MODEL is None:
         if not QUIET:
             print("Loading YOLO model...")
         try:
-            model_path = get_model_path()
-            if not QUIET:
-                print(f"Using model path: {model_path}")
-            MODEL = YOLO(model_path)
-            CLASS_NAMES = MODEL.model.names
+            ir_dir = get_model_path(OPENVINO_MODEL_DIR)
+            onnx_path = get_model_path(ONNX_MODEL_NAME)
+            # INT8 CPU backends are only preferred without a GPU, CUDA keeps the FP16 PyTorch path
+            cpu_only = not torch.cuda.is_available()
+            if cpu_only and ov is not None and os.path.isdir(ir_dir):
+                if not QUIET:
+                    print(f"Using OpenVINO model path: {ir_dir}")
+                MODEL = OpenVinoDetector(ir_dir)
+                CLASS_NAMES = MODEL.names
+            elif cpu_only and ort is not None and os.path.exists(onnx_path):
+                if not QUIET:
+                    print(f"Using ONNX model path: {onnx_path}")
+                MODEL = OnnxDetector(onnx_path)
+                CLASS_NAMES = MODEL.names
+            else:
+                model_path = get_model_path()
+                if not QUIET:
+                    print(f"Using model path: {model_path}")
+                device = "cuda" if torch.cuda.is_available() else "cpu"
+                MODEL = TorchDetector(model_path, device)
+                CLASS_NAMES = MODEL.names
+                # Input shape is fixed, let cuDNN pick the fastest conv algorithms once
+                torch.backends.cudnn.benchmark = device == "cuda"
+                if not QUIET:
+                    print(f"Inference device: {device}{' (FP16)' if MODEL.half else ''}")
+                MODEL.compile_pending = COMPILE_MODEL
+            _resolve_class_ids(CLASS_NAMES or {})
             if not QUIET:
                 print("YOLO model loaded successfully")
         except Exception as e:
@@ -119,45 +497,78 @@ def ensure_model():
     return MODEL, CLASS_NAMES or {}
 
 # ------------------ FRAME EVALUATION ------------------
-def _evaluate_frame(frame):
-    model, names = ensure_model()
-    resized = resize_w(frame, WIDTH)
+def _evaluate_frame(frame, collect_detections=True):
+    return _evaluate_frames([frame], collect_detections)[0]
+
+def _evaluate_frames(frames, collect_detections=True):
+    """Run the model once over a batch of frames and evaluate each result.
+
+    Per-box detections (only needed for drawing) are skipped unless collect_detections is set.
+    """
+    model, _ = ensure_model()
+    blob = _preprocess(frames, WIDTH, model.device)
+    if getattr(model, "compile_pending", False):
+        # The first camera frame (or video batch) is the verification input for torch.compile
+        model.compile_pending = False
+        _compile_model(model, blob[:1].clone())
     # Lower confidence threshold to catch more detections (default is 0.25)
-    results = model(resized, imgsz=WIDTH, conf=0.3, verbose=False)[0]
+    with torch.inference_mode():
+        results_list = model(blob, imgsz=WIDTH, conf=0.3, iou=NMS_IOU, verbose=False)
+
+    if log.isEnabledFor(logging.DEBUG):
+        for frame in frames:
+            log.debug("Frame shape: %s, Input shape: %s", frame.shape, tuple(blob.shape[1:]))
+
+    return [
+        _evaluate_result(results, frame.shape[:2], collect_detections)
+        for results, frame in zip(results_list, frames)
+    ]
+
+def _class_names(class_ids):
+    """Names for an array of class ids, falling back to str(id) for ids outside NAMES_ARR"""
+    if class_ids.size and class_ids.max() >= len(NAMES_ARR):
+        return [NAMES_ARR[cid] if cid < len(NAMES_ARR) else str(cid) for cid in class_ids.tolist()]
+    return NAMES_ARR[class_ids].tolist()
 
+def _evaluate_result(results, orig_shape, collect_detections=True):
     events = []
     detections = []
     devices = set()
+    phone_detected = False
     person_count = 0
-
-    print(f"DEBUG: Frame shape: {frame.shape}, Resized shape: {resized.shape}")
+    debug = log.isEnabledFor(logging.DEBUG)
 
     boxes = results.boxes
     if boxes is not None:
-        xyxy = boxes.xyxy.cpu().numpy()
-        confs = boxes.conf.cpu().numpy()
-        clss = boxes.cls.cpu().numpy()
-
-        print(f"DEBUG: Detected {len(xyxy)} objects")
+        # boxes.data rows are [x1, y1, x2, y2, conf, cls]: a single device -> host copy
+        arr = boxes.data.cpu().numpy()
+        confs = arr[:, -2]
+        clss = arr[:, -1].astype(np.int32)
 
-        for (x1, y1, x2, y2), conf, cls_idx in zip(xyxy, confs, clss):
-            cls_name = names.get(int(cls_idx), str(cls_idx))
-            
-            print(f"DEBUG: Detected {cls_name} with confidence {conf:.2f}")
+        if debug:
+            log.debug("Detected %s objects", len(arr))
 
-            if cls_name == PERSON_LABEL:
-                person_count += 1
+        person_count = int(np.sum(clss == PERSON_CLASS_ID))
+        device_ids = np.unique(clss[np.isin(clss, list(DEVICE_CLASS_IDS))])
+        devices = set(_class_names(device_ids))
+        phone_detected = any(cid in PHONE_CLASS_IDS for cid in device_ids)
 
-            if any(keyword in cls_name.lower() for keyword in DEVICE_KEYWORDS):
-                devices.add(cls_name)
+        if collect_detections:
+            # Boxes come back in letterboxed input coordinates
+            xyxy = ops.scale_boxes((WIDTH, WIDTH), arr[:, :4].copy(), orig_shape)
+            # One vectorized cast, then tolist() hands back plain Python ints/floats for cv2
+            boxes_int = xyxy.astype(np.int32).tolist()
+            cls_names = _class_names(clss)
+            for (x1, y1, x2, y2), conf, cls_name in zip(boxes_int, confs.tolist(), cls_names):
+                if debug:
+                    log.debug("Detected %s with confidence %.2f", cls_name, conf)
 
-            detections.append(
-                (int(x1), int(y1), int(x2), int(y2), cls_name, float(conf))
-            )
-    else:
-        print("DEBUG: No boxes detected in results")
+                detections.append((x1, y1, x2, y2, cls_name, conf))
+    elif debug:
+        log.debug("No boxes detected in results")
 
-    print(f"DEBUG: Person count: {person_count}, Devices: {list(devices)}")
+    if debug:
+        log.debug("Person count: %s, Devices: %s", person_count, list(devices))
 
     if person_count == 0:
         events.append({
@@ -174,7 +585,7 @@ def _evaluate_frame(frame):
 
     if devices:
         device_list = ", ".join(sorted(devices))
-        label = "Phone detected" if any("phone" in d.lower() for d in devices) else "Device detected"
+        label = "Phone detected" if phone_detected else "Device detected"
         events.append({
             "type": label,
             "severity": "high",
@@ -205,193 +616,364 @@ def summarize_events(events):
     }
 
 # ------------------ VIDEO ANALYSIS ------------------
-def analyze_video_file(path, max_frames=8):
-    # Check file existence and size
-    if not os.path.exists(path):
-        error_msg = f"Video file does not exist: {path}"
-        print(f"ERROR: {error_msg}")
-        return {"hasViolation": False, "error": error_msg}
-    
-    file_size = os.path.getsize(path)
-    print(f"DEBUG: Video file size: {file_size} bytes")
-    
-    # Check file magic bytes to identify format
-    with open(path, 'rb') as f:
-        magic = f.read(12)
-        print(f"DEBUG: File magic bytes (hex): {magic.hex()}")
-        # WebM starts with 0x1A45DFA3
-        # MP4 has 'ftyp' at bytes 4-7
-        if len(magic) >= 4:
-            if magic[:4] == b'\x1a\x45\xdf\xa3':
-                print("DEBUG: File format detected: WebM (Matroska-based)")
-            elif b'ftyp' in magic:
-                print("DEBUG: File format detected: MP4")
-            elif magic[:3] == b'ID3' or magic[:2] == b'FF':
-                print("DEBUG: File format detected: Audio format")
-            else:
-                print(f"DEBUG: Unknown format, first 4 bytes: {magic[:4]}")
-    
-    # Try to open the video file with default backend
-    print("DEBUG: Attempting to open with default backend...")
-    cap = cv2.VideoCapture(path)
-    mp4_path = None  # Track if we create a converted MP4
-    use_ffmpeg_extract = False  # Track if we need to use ffmpeg frame extraction
-    
-    if not cap.isOpened():
-        error_msg = f"Unable to open video file with cv2: {path} (size: {file_size} bytes)"
-        print(f"ERROR: {error_msg}")
-        
-        # Try with FFMPEG backend explicitly
-        print("DEBUG: Trying with explicit FFMPEG backend (cv2.CAP_FFMPEG)...")
-        cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG)
-        if not cap.isOpened():
-            print(f"ERROR: FFMPEG backend also failed")
-            
-            # Fall back to ffmpeg frame extraction
-            print("DEBUG: Will use ffmpeg to extract individual frames instead...")
-            use_ffmpeg_extract = True
-            # Don't return error - we'll try ffmpeg extraction below
-
-    # If cv2 couldn't open it, try ffmpeg frame extraction
-    if use_ffmpeg_extract:
-        print("DEBUG: Extracting frames using ffmpeg...")
+def _analyze_batch(frames, aggregated):
+    """Evaluate a batch of frames, returns True once a high severity event is found"""
+    for result in _evaluate_frames(frames, collect_detections=False):
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("Frame events: %s", result['events'])
+        aggregated.extend(result["events"])
+
+    if any(evt.get("severity") == "high" for evt in aggregated):
+        log.debug("High severity event detected, stopping early")
+        return True
+    return False
+
+def _analyze_frames(frames):
+    """Evaluate an iterable of frames in batches, stopping at the first high severity event"""
+    aggregated = []
+    batch = []
+    processed = 0
+    for frame in frames:
+        batch.append(frame)
+        processed += 1
+        if len(batch) == BATCH_SIZE:
+            stop = _analyze_batch(batch, aggregated)
+            batch = []
+            if stop:
+                break
+
+    if batch:
+        _analyze_batch(batch, aggregated)
+
+    log.debug("Video analysis complete - Processed %s frames, Total events: %s", processed, len(aggregated))
+    return summarize_events(aggregated)
+
+def _av_duration(container, stream):
+    """Duration of a PyAV video stream in seconds, scanning packet timestamps when the header has none"""
+    if container.duration:
+        return container.duration / av.time_base
+    if stream.duration and stream.time_base:
+        return float(stream.duration * stream.time_base)
+
+    # MediaRecorder WebM has no Duration element: demux (no decoding) to the last packet, then rewind
+    end = 0.0
+    for packet in container.demux(stream):
+        if packet.pts is not None and packet.time_base:
+            end = max(end, float((packet.pts + (packet.duration or 0)) * packet.time_base))
+    container.seek(0, stream=stream)
+    return end
+
+def _iter_av_frames(path, max_frames):
+    """Decode a video with PyAV and yield about one BGR frame per second, up to max_frames.
+
+    Every packet still has to be decoded, but only sampled frames are converted to ndarrays.
+    """
+    with av.open(path) as container:
+        stream = container.streams.video[0]
+        stream.thread_type = "AUTO"
+        # Spread samples over long videos, otherwise 1 frame per second like the ffmpeg fallback
+        duration = _av_duration(container, stream)
+        interval = max(1.0, duration / max_frames)
+
+        next_time = 0.0
+        count = 0
+        for frame in container.decode(stream):
+            if frame.time is not None and frame.time < next_time:
+                continue
+            yield frame.to_ndarray(format="bgr24")
+            count += 1
+            if count >= max_frames:
+                return
+            next_time += interval
+
+def _iter_cv2_frames(cap, max_frames):
+    """Yield up to max_frames evenly strided BGR frames from an opened cv2 capture"""
+    try:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 1
+        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+
+        log.debug("Video metadata - Resolution: %sx%s, FPS: %s, Total frames: %s", width, height, fps, total_frames)
+
+        # Sanity check
+        if width == 0 or height == 0:
+            raise VideoReadError(f"Invalid video dimensions: {width}x{height}")
+
+        stride = max(1, total_frames // max_frames)
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+        log.debug("Processing parameters - Stride: %s, Max frames: %s", stride, max_frames)
+
+        idx = 0
+        processed = 0
+        while processed < max_frames:
+            # Skipped frames are only grabbed (demuxed), never decoded
+            if idx % stride != 0:
+                if not cap.grab():
+                    log.debug("End of video reached at frame %s", idx)
+                    break
+                idx += 1
+                continue
+
+            if not cap.grab():
+                log.debug("End of video reached at frame %s", idx)
+                break
+            ret, frame = cap.retrieve()
+
+            if not ret or frame is None:
+                log.debug("Frame %s could not be decoded, skipping", idx)
+                idx += 1
+                continue
+
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug("Queued frame %s (processed count: %s, shape: %s)", idx, processed, frame.shape)
+            yield frame
+            processed += 1
+            idx += 1
+    finally:
+        cap.release()
+
+FFMPEG_READ_TIMEOUT = 30  # seconds to wait for each frame from the ffmpeg pipe
+
+def _stride_sample(frames, max_frames):
+    """Pick up to max_frames evenly strided items, like the old 1 fps extract-then-stride path"""
+    stride = max(1, len(frames) // max_frames)
+    return frames[::stride][:max_frames]
+
+def _iter_ffmpeg_frames(path, max_frames):
+    """Stream raw BGR frames from an ffmpeg subprocess, sampled over the whole clip (no temp files).
+
+    With a known duration the fps filter spreads max_frames samples over the clip. Otherwise
+    frames are taken at 1 fps and strided once the whole clip has been read.
+    """
+    import subprocess
+    import tempfile
+
+    try:
+        probe = subprocess.run(
+            [
+                'ffprobe',
+                '-v', 'error',
+                '-select_streams', 'v:0',
+                '-show_entries', 'stream=width,height:format=duration',
+                '-of', 'default=noprint_wrappers=1',
+                path
+            ],
+            capture_output=True,
+            timeout=30
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        raise VideoReadError(f"ffprobe failed: {e}") from e
+    info = dict(
+        line.split('=', 1) for line in probe.stdout.decode().splitlines() if '=' in line
+    )
+    if probe.returncode != 0 or not info.get('width', '').isdigit() or not info.get('height', '').isdigit():
+        raise VideoReadError(f"ffprobe could not read video stream: {probe.stderr.decode()[:500]}")
+    width, height = int(info['width']), int(info['height'])
+    try:
+        duration = float(info.get('duration', ''))
+    except ValueError:
+        duration = None  # e.g. MediaRecorder WebM without a Duration element
+    frame_bytes = width * height * 3
+
+    if duration and duration > max_frames:
+        rate = f"{max_frames / duration:.6f}"
+    else:
+        rate = "1"  # 1 frame per second
+    buffer_all = duration is None
+    log.debug("Streaming frames with ffmpeg - Resolution: %sx%s, Duration: %s, fps: %s, Max frames: %s",
+              width, height, duration, rate, max_frames)
+
+    # A file rather than a pipe, so a chatty ffmpeg can never block on a full stderr pipe
+    with tempfile.TemporaryFile() as stderr_file:
         try:
-            import subprocess
-            # Create temp directory for frames
-            frames_dir = path.replace('.webm', '_frames')
-            os.makedirs(frames_dir, exist_ok=True)
-            
-            # Extract frames using ffmpeg
-            print(f"DEBUG: Extracting frames to {frames_dir}")
-            result = subprocess.run(
+            proc = subprocess.Popen(
                 [
                     'ffmpeg',
+                    '-v', 'error',
+                    # Frames must keep ffprobe's coded width x height for the reshape below
+                    '-noautorotate',
                     '-i', path,
-                    '-vf', f'fps=1',  # 1 frame per second
-                    os.path.join(frames_dir, 'frame_%04d.png')
+                    '-vf', f'fps={rate}',
+                    '-f', 'rawvideo',
+                    '-pix_fmt', 'bgr24',
+                    'pipe:1'
                 ],
-                capture_output=True,
-                timeout=30
+                stdout=subprocess.PIPE,
+                stderr=stderr_file
             )
-            
-            if result.returncode != 0:
-                print(f"ERROR: ffmpeg frame extraction failed: {result.stderr.decode()[:500]}")
-                return {"hasViolation": False, "error": "Could not extract frames from video"}
-            
-            # Get list of extracted frames
-            import glob
-            frame_files = sorted(glob.glob(os.path.join(frames_dir, 'frame_*.png')))
-            print(f"DEBUG: Extracted {len(frame_files)} frames")
-            
-            if not frame_files:
-                print("ERROR: No frames extracted")
-                return {"hasViolation": False, "error": "No frames could be extracted"}
-            
-            # Process frames
-            aggregated = []
-            stride = max(1, len(frame_files) // max_frames)
-            print(f"DEBUG: Processing parameters - Stride: {stride}, Max frames: {max_frames}")
-            
-            processed = 0
-            for idx, frame_file in enumerate(frame_files):
-                if idx % stride != 0:
-                    continue
-                
-                if processed >= max_frames:
-                    break
-                
-                frame = cv2.imread(frame_file)
+        except OSError as e:
+            raise VideoReadError(f"ffmpeg failed to start: {e}") from e
+
+        timed_out = threading.Event()
+
+        def on_timeout():
+            timed_out.set()
+            proc.kill()
+
+        def read_frame():
+            # Killing a stalled ffmpeg unblocks the read, so the producer thread cannot hang
+            timer = threading.Timer(FFMPEG_READ_TIMEOUT, on_timeout)
+            timer.start()
+            try:
+                buf = proc.stdout.read(frame_bytes)
+            finally:
+                timer.cancel()
+            if len(buf) < frame_bytes:
+                return None
+            return np.frombuffer(buf, dtype=np.uint8).reshape(height, width, 3)
+
+        def check_exit(count):
+            if timed_out.is_set():
+                raise VideoReadError(f"ffmpeg produced no frame within {FFMPEG_READ_TIMEOUT}s")
+            try:
+                returncode = proc.wait(timeout=30)
+            except subprocess.TimeoutExpired as e:
+                raise VideoReadError("ffmpeg did not exit after its output ended") from e
+            if returncode != 0:
+                stderr_file.seek(0)
+                raise VideoReadError(f"ffmpeg frame extraction failed: {stderr_file.read().decode(errors='replace')[:500]}")
+            if count == 0:
+                raise VideoReadError("No frames could be extracted")
+
+        try:
+            if buffer_all:
+                # Unknown length: read every 1 fps frame, then stride over all of them
+                frames = []
+                while (frame := read_frame()) is not None:
+                    frames.append(frame)
+                check_exit(len(frames))
+                yield from _stride_sample(frames, max_frames)
+                return
+
+            count = 0
+            while count < max_frames:
+                frame = read_frame()
                 if frame is None:
-                    print(f"DEBUG: Could not read frame {frame_file}")
-                    continue
-                
-                print(f"DEBUG: Processing frame {idx} from file {frame_file}")
-                result = _evaluate_frame(frame)
-                print(f"DEBUG: Frame {idx} events: {result['events']}")
-                aggregated.extend(result["events"])
-                processed += 1
-                
-                if any(evt.get("severity") == "high" for evt in aggregated):
-                    print(f"DEBUG: High severity event detected, stopping early")
                     break
-            
-            # Clean up frames directory
+                yield frame
+                count += 1
+
+            if count < max_frames:
+                # ffmpeg stopped early: tell a decode failure apart from a short video
+                check_exit(count)
+        finally:
+            # Stops decoding as soon as the consumer is done with the frames
+            proc.kill()
+            proc.wait()
+
+_END_OF_FRAMES = object()
+
+def _prefetch(frames, depth=BATCH_SIZE):
+    """Decode frames on a background thread so decoding overlaps with inference.
+
+    Up to depth frames are buffered. Closing the returned generator (e.g. on early exit)
+    stops the producer and closes the underlying frame iterator.
+    """
+    buffered = queue.Queue(maxsize=depth)
+    stop = threading.Event()
+
+    def put(item):
+        while not stop.is_set():
             try:
-                import shutil
-                shutil.rmtree(frames_dir)
-                print(f"DEBUG: Cleaned up frames directory")
-            except:
+                buffered.put(item, timeout=0.1)
+                return True
+            except queue.Full:
                 pass
-            
-            print(f"DEBUG: Video analysis complete - Processed {processed} frames, Total events: {len(aggregated)}")
-            return summarize_events(aggregated)
-            
+        return False
+
+    def produce():
+        item = _END_OF_FRAMES
+        try:
+            for frame in frames:
+                if not put(frame):
+                    return
         except Exception as e:
-            print(f"ERROR: FFmpeg frame extraction failed: {e}")
-            return {"hasViolation": False, "error": f"Video processing failed: {str(e)}"}
-
-    # If we have a valid cv2 video capture, process it normally
-    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or 1
-    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-    fps = cap.get(cv2.CAP_PROP_FPS)
-    
-    print(f"DEBUG: Video metadata - Resolution: {width}x{height}, FPS: {fps}, Total frames: {total_frames}")
-    
-    # Sanity check
-    if width == 0 or height == 0:
-        error_msg = f"Invalid video dimensions: {width}x{height}"
-        print(f"ERROR: {error_msg}")
-        cap.release()
-        return {"hasViolation": False, "error": error_msg}
-    
-    stride = max(1, total_frames // max_frames)
-    
-    print(f"DEBUG: Processing parameters - Stride: {stride}, Max frames: {max_frames}")
-    
-    idx = 0
-    processed = 0
-    aggregated = []
+            item = e
+        finally:
+            # Generators must be closed from the thread that runs them
+            frames.close()
+        put(item)
 
-    while processed < max_frames:
-        ret, frame = cap.read()
-        if not ret:
-            print(f"DEBUG: End of video reached at frame {idx}")
-            break
+    worker = threading.Thread(target=produce, name="frame-decoder", daemon=True)
+    worker.start()
+    try:
+        while True:
+            item = buffered.get()
+            if item is _END_OF_FRAMES:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+    finally:
+        stop.set()
+        worker.join()
 
-        if frame is None:
-            print(f"DEBUG: Frame {idx} is None, skipping")
-            idx += 1
-            continue
+def _iter_frames(path, max_frames):
+    """Lazily yield sampled BGR frames from a video, using the first decoder that can open it.
 
-        if idx % stride == 0:
-            print(f"DEBUG: Processing frame {idx} (processed count: {processed}, shape: {frame.shape})")
-            result = _evaluate_frame(frame)
-            print(f"DEBUG: Frame {idx} events: {result['events']}")
-            aggregated.extend(result["events"])
-            processed += 1
-            if any(evt.get("severity") == "high" for evt in aggregated):
-                print(f"DEBUG: High severity event detected, stopping early")
-                break
+    Frames are decoded only as they are consumed, so an early exit also stops decoding.
+    """
+    # Prefer the FFMPEG backend: it supports grab() without decoding
+    log.debug("Attempting to open with FFMPEG backend (cv2.CAP_FFMPEG)...")
+    cap = cv2.VideoCapture(path, cv2.CAP_FFMPEG)
+    if not cap.isOpened():
+        log.debug("FFMPEG backend failed, trying with default backend...")
+        cap = cv2.VideoCapture(path)
 
-        idx += 1
+    if cap.isOpened():
+        yield from _iter_cv2_frames(cap, max_frames)
+        return
 
     cap.release()
-    
-    # Clean up converted MP4 file if we created one
-    if mp4_path and os.path.exists(mp4_path):
+    log.debug("cv2 could not open %s", path)
+    if av is not None:
+        log.debug("Decoding frames with PyAV...")
         try:
-            os.remove(mp4_path)
-            print(f"DEBUG: Cleaned up converted MP4 file")
-        except Exception as e:
-            print(f"DEBUG: Could not delete MP4 file: {e}")
+            yield from _iter_av_frames(path, max_frames)
+        except (av.error.FFmpegError, IndexError) as e:
+            raise VideoReadError(f"PyAV could not decode video: {e}") from e
+    else:
+        log.debug("Streaming frames with ffmpeg...")
+        yield from _iter_ffmpeg_frames(path, max_frames)
+
+def analyze_video_file(path, max_frames=8):
+    # Check file existence and size
+    if not os.path.exists(path):
+        error_msg = f"Video file does not exist: {path}"
+        log.error(error_msg)
+        return {"hasViolation": False, "error": error_msg}
     
-    print(f"DEBUG: Video analysis complete - Processed {processed} frames, Total events: {len(aggregated)}")
+    file_size = os.path.getsize(path)
+    log.debug("Video file size: %s bytes", file_size)
     
-    return summarize_events(aggregated)
+    # Check file magic bytes to identify format
+    with open(path, 'rb') as f:
+        magic = f.read(12)
+        log.debug("File magic bytes (hex): %s", magic.hex())
+        # WebM starts with 0x1A45DFA3
+        # MP4 has 'ftyp' at bytes 4-7
+        if len(magic) >= 4:
+            if magic[:4] == b'\x1a\x45\xdf\xa3':
+                log.debug("File format detected: WebM (Matroska-based)")
+            elif b'ftyp' in magic:
+                log.debug("File format detected: MP4")
+            elif magic[:3] == b'ID3' or magic[:2] == b'FF':
+                log.debug("File format detected: Audio format")
+            else:
+                log.debug("Unknown format, first 4 bytes: %s", magic[:4])
+
+    try:
+        return _analyze_frames(_prefetch(_iter_frames(path, max_frames)))
+    except VideoReadError as e:
+        log.error("%s (size: %s bytes)", e, file_size)
+        return {"hasViolation": False, "error": str(e)}
 
 # ------------------ WEBCAM MODE ------------------
 def run_stream_mode():
+    # Load the model before opening the camera (--compile happens on the first frame)
+    ensure_model()
     cap = cv2.VideoCapture(VIDEO_SOURCE)
     if not cap.isOpened():
         print("Webcam not accessible")
@@ -400,16 +982,21 @@ def run_stream_mode():
     prev = time.time()
     print("Running... Press Q to stop.")
 
+    frame_idx = 0
+    detections = []
+
     while True:
         ret, frame = cap.read()
         if not ret:
             break
 
-        result = _evaluate_frame(frame)
-        detections = result["detections"]
+        if frame_idx % DETECT_EVERY == 0:
+            result = _evaluate_frame(frame)
+            detections = result["detections"]
 
-        for event in result["events"]:
-            log_event(event["type"], event.get("details", ""))
+            for event in result["events"]:
+                log_event(event["type"], event.get("details", ""))
+        frame_idx += 1
 
         now = time.time()
         fps = 1 / (now - prev)
@@ -448,16 +1035,28 @@ def run_stream_mode():
 
 # ------------------ MAIN ------------------
 def main():
-    global QUIET
+    global QUIET, COMPILE_MODEL
 
     parser = argparse.ArgumentParser(description="Pariksha AI Proctoring Model")
-    parser.add_argument("--mode", choices=["stream", "analyze-video"], default="stream")
-    parser.add_argument("--video")
+    parser.add_argument(
+        "--mode", choices=["stream", "analyze-video", "export-onnx", "export-openvino"], default="stream"
+    )
+    parser.add_argument("--video", help="video to analyze, or calibration video for export-onnx")
     parser.add_argument("--max-frames", type=int, default=8)
     parser.add_argument("--quiet", action="store_true")
+    parser.add_argument(
+        "--compile",
+        action="store_true",
+        help="torch.compile the model on the first frame (pays off in stream mode, not per-chunk analysis)",
+    )
 
     args = parser.parse_args()
     QUIET = bool(args.quiet)
+    COMPILE_MODEL = bool(args.compile)
+    # Root stays at WARNING so third-party debug output (urllib3, PIL, ...) is not shown
+    logging.basicConfig(stream=sys.stderr, level=logging.WARNING, format="%(levelname)s: %(message)s")
+    log.setLevel(logging.WARNING if QUIET else logging.DEBUG)
+    configure_opencv()
 
     try:
         if args.mode == "analyze-video":
@@ -469,6 +1068,18 @@ def main():
             print(json.dumps(result))
             return
 
+        if args.mode == "export-onnx":
+            if not args.video:
+                print("A calibration video is required: --video <path>")
+                return
+
+            print(f"INT8 ONNX model written to {export_onnx_int8(args.video)}")
+            return
+
+        if args.mode == "export-openvino":
+            print(f"INT8 OpenVINO model written to {export_openvino_int8()}")
+            return
+
         run_stream_mode()
 
     except Exception as e: